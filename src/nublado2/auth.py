@@ -2,6 +2,10 @@
 
 from __future__ import annotations
 
+import copy
+import hashlib
+import json
+import time
 from typing import TYPE_CHECKING
 
 from jupyterhub.auth import Authenticator
@@ -21,6 +25,81 @@ if TYPE_CHECKING:
     from tornado.web import RequestHandler
 
     Route = Tuple[str, Type[BaseHandler]]
+    LookupFailure = Tuple[int, Optional[str]]
+    CachedLookup = Tuple[float, Union[Dict[str, Any], LookupFailure]]
+
+
+_AUTH_CACHE_LIFETIME = 300
+"""How long, in seconds, to remember the result of a token lookup.
+
+This matches the five minutes for which the ingress caches Gafaelfawr
+authentication results, so caching here never makes group or UID changes
+take longer to be noticed than they already do.
+"""
+
+_AUTH_FAILURE_CACHE_LIFETIME = 2
+"""How long, in seconds, to remember that a token lookup failed.
+
+This is kept short so that a token that starts working, or a Gafaelfawr that
+recovers, is noticed almost immediately.  It only needs to be long enough to
+absorb a burst of retries with the same bad token.
+"""
+
+_AUTH_CACHE_SIZE = 10000
+"""Maximum number of token lookups to remember."""
+
+_MAX_USER_INFO_SIZE = 65536
+"""Maximum size, in bytes, of a Gafaelfawr user-info response to accept."""
+
+_auth_cache: Dict[str, CachedLookup] = {}
+"""Cache of token lookups.
+
+The key is the SHA-256 hash of the token rather than the token itself, and
+the value is the expiration time (from `time.monotonic`) and either the auth
+info built from the token or the status code and message of the error raised
+when looking it up.  Only the status and message of an error are kept, since
+the exception itself would hold on to the frames of the failed lookup.
+"""
+
+
+def _cache_auth_result(
+    key: str,
+    result: Union[Dict[str, Any], LookupFailure],
+    lifetime: float,
+) -> None:
+    """Remember the result of a token lookup, evicting old entries."""
+    now = time.monotonic()
+    if len(_auth_cache) >= _AUTH_CACHE_SIZE:
+        for stale in [k for k, v in _auth_cache.items() if v[0] <= now]:
+            del _auth_cache[stale]
+    if len(_auth_cache) >= _AUTH_CACHE_SIZE:
+        del _auth_cache[next(iter(_auth_cache))]
+    _auth_cache[key] = (now + lifetime, result)
+
+
+async def _get_user_info(base_url: str, token: str) -> Dict[str, Any]:
+    """Retrieve the metadata for a token from Gafaelfawr."""
+    api_url = url_path_join(base_url, "/auth/api/v1/user-info")
+    session = await get_session()
+    async with session.get(
+        api_url, headers={"Authorization": f"bearer {token}"}
+    ) as resp:
+        if resp.status != 200:
+            raise web.HTTPError(500, "Cannot reach token analysis API")
+        try:
+            # The real response is at most a few KB.  Don't let a broken or
+            # misbehaving server make us buffer an unbounded amount of data.
+            body = bytearray()
+            async for chunk in resp.content.iter_chunked(8192):
+                body.extend(chunk)
+                if len(body) > _MAX_USER_INFO_SIZE:
+                    raise ValueError("User-info response too large")
+            user_info = json.loads(body)
+        except Exception:
+            raise web.HTTPError(500, "Cannot get information for token")
+    if "username" not in user_info or "uid" not in user_info:
+        raise web.HTTPError(403, "Request token is invalid")
+    return user_info
 
 
 async def _build_auth_info(headers: HTTPHeaders) -> Dict[str, Any]:
@@ -30,11 +109,27 @@ async def _build_auth_info(headers: HTTPHeaders) -> Dict[str, Any]:
     metadata for the token, and use that data to build an auth info dict
     in the format expected by JupyterHub.  This is in a separate method so
     that it can be unit-tested.
+
+    The same token is often presented several times in quick succession, so
+    the results are cached for a short time to avoid asking Gafaelfawr about
+    it again.  Failures are cached too, but only very briefly, so that a
+    client retrying with a bad token doesn't turn into a flood of requests
+    to Gafaelfawr.
     """
     token = headers.get("X-Auth-Request-Token")
     if not token:
         raise web.HTTPError(401, "No request token")
 
+    key = hashlib.sha256(token.encode()).hexdigest()
+    cached = _auth_cache.get(key)
+    if cached and cached[0] > time.monotonic():
+        result = cached[1]
+        if isinstance(result, tuple):
+            raise web.HTTPError(*result)
+        return copy.deepcopy(result)
+    elif cached:
+        del _auth_cache[key]
+
     config = NubladoConfig()
     if not config.gafaelfawr_token:
         raise web.HTTPError(500, "gafaelfawr_token not set in configuration")
@@ -42,27 +137,21 @@ async def _build_auth_info(headers: HTTPHeaders) -> Dict[str, Any]:
         raise web.HTTPError(500, "base_url not set in configuration")
 
     # Retrieve the token metadata.
-    api_url = url_path_join(config.base_url, "/auth/api/v1/user-info")
-    session = await get_session()
-    resp = await session.get(
-        api_url, headers={"Authorization": f"bearer {token}"}
-    )
-    if resp.status != 200:
-        raise web.HTTPError(500, "Cannot reach token analysis API")
     try:
-        auth_state = await resp.json()
-    except Exception:
-        raise web.HTTPError(500, "Cannot get information for token")
-    if "username" not in auth_state or "uid" not in auth_state:
-        raise web.HTTPError(403, "Request token is invalid")
+        auth_state = await _get_user_info(config.base_url, token)
+    except web.HTTPError as e:
+        failure = (e.status_code, e.log_message)
+        _cache_auth_result(key, failure, _AUTH_FAILURE_CACHE_LIFETIME)
+        raise
 
     auth_state["token"] = token
-    if "groups" not in auth_state:
-        auth_state["groups"] = []
-    return {
+    auth_state.setdefault("groups", [])
+    auth_info = {
         "name": auth_state["username"],
         "auth_state": auth_state,
     }
+    _cache_auth_result(key, copy.deepcopy(auth_info), _AUTH_CACHE_LIFETIME)
+    return auth_info
 
 
 class GafaelfawrAuthenticator(Authenticator):
@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any, Dict
 
 import inflect
@@ -14,6 +15,15 @@ CRDBody = Dict[str, Any]
 _p = inflect.engine()
 
 
+@lru_cache(maxsize=256)
+def _plural(kind: str) -> str:
+    """Return the plural of a lowercased object Kind.
+
+    inflect's rule matching is slow, and the same few custom resource kinds
+    are created on every spawn, so remember the answers."""
+    return _p.plural(kind)
+
+
 @dataclass(frozen=True)
 class CRDParser:
     group: str
@@ -43,5 +53,5 @@ class CRDParser:
             group=group,
             version=version,
             name=body["metadata"]["name"],
-            plural=_p.plural(body["kind"].lower()),
+            plural=_plural(body["kind"].lower()),
         )
@@ -49,7 +49,9 @@ class NubladoHooks(LoggingConfigurable):
         # which is useful for dask.
         spawner.service_account = f"{spawner.user.name}-serviceaccount"
 
-        await self.resourcemgr.create_user_resources(spawner, options)
+        await self.resourcemgr.create_user_resources(
+            spawner, options, auth_state
+        )
 
     async def post_stop(self, spawner: Spawner) -> None:
         user = spawner.user.name
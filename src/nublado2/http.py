@@ -1,6 +1,8 @@
-from aiohttp import ClientSession
+from typing import Optional
 
-_session = None
+from aiohttp import ClientSession, TCPConnector
+
+_session: Optional[ClientSession] = None
 
 
 async def get_session() -> ClientSession:
@@ -10,8 +12,16 @@ async def get_session() -> ClientSession:
     calling this, you ensure it exists, or create it if it doesn't.
 
     Since there are some connection pools, we don't want to be creating
-    these all the time.  Better to just reuse one."""
+    these all the time.  Better to just reuse one.  If the shared session
+    has been closed, such as during shutdown or between test event loops,
+    create a new one rather than handing out a session that will fail.
+
+    Nearly all requests go to the same few hosts (Gafaelfawr, moneypenny,
+    and cachemachine), so keep idle connections and DNS results around
+    longer than the aiohttp defaults to avoid reconnecting on every login
+    and spawn."""
     global _session
-    if not _session:
-        _session = ClientSession()
+    if not _session or _session.closed:
+        connector = TCPConnector(ttl_dns_cache=300, keepalive_timeout=60)
+        _session = ClientSession(connector=connector)
     return _session
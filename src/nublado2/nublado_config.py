@@ -2,23 +2,39 @@
 
 __all__ = ["NubladoConfig"]
 
+from functools import lru_cache
 from typing import Any, Dict, List, Optional
 
-from ruamel import yaml
-from ruamel.yaml import RoundTripLoader
+from ruamel.yaml import YAML
 
 from nublado2.imageinfo import ImageInfo
 from nublado2.labsize import LabSize
 
+# The configuration is only read, never written back out, so the safe loader
+# (backed by the libyaml C parser) is sufficient.  Share one instance rather
+# than building a new loader each time the configuration is loaded.
+_yaml = YAML(typ="safe")
+
+
+@lru_cache(maxsize=1)
+def _load_config() -> Any:
+    """Load and parse the nublado_config.yaml file.
+
+    NubladoConfig objects are created on every login and spawn, but the
+    file only changes when the hub is redeployed, so only parse it once.
+    """
+    with open("/etc/jupyterhub/nublado_config.yaml") as f:
+        return _yaml.load(f)
+
 
 class NubladoConfig:
     def __init__(self) -> None:
         """Load the nublado_config.yaml file from disk.
 
         This file normally comes from mounting a configmap with the
-        nublado_config.yaml mounted into the hub container."""
-        with open("/etc/jupyterhub/nublado_config.yaml") as f:
-            self._config = yaml.load(f.read(), Loader=RoundTripLoader)
+        nublado_config.yaml mounted into the hub container.  The parsed
+        file is shared by all instances, so callers must not modify it."""
+        self._config = _load_config()
 
         self._sizes = {
             s.name: s
@@ -131,11 +131,10 @@ class NubladoOptions(LoggingConfigurable):
             return ([], [])
 
         session = await get_session()
-        r = await session.get(url)
-        if r.status != 200:
-            raise Exception(f"Error {r.status} from {url}")
-
-        body = await r.json()
+        async with session.get(url) as r:
+            if r.status != 200:
+                raise Exception(f"Error {r.status} from {url}")
+            body = await r.json()
 
         cached_images = [
             ImageInfo.from_cachemachine_entry(img) for img in body["images"]
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import asyncio
+from typing import Any, Dict
 from urllib.parse import urljoin
 
 from aiohttp import ClientTimeout
@@ -14,6 +16,12 @@ from nublado2.nublado_config import NubladoConfig
 
 __all__ = ["Provisioner"]
 
+WAIT_ATTEMPTS = 2
+"""Number of times to try the moneypenny wait endpoint before giving up."""
+
+WAIT_TIMEOUT = 300
+"""How long, in seconds, to wait on a single request to moneypenny."""
+
 
 class Provisioner(LoggingConfigurable):
     """Provision home directories using the moneypenny service."""
@@ -21,18 +29,24 @@ class Provisioner(LoggingConfigurable):
     def __init__(self) -> None:
         self.nublado_config = NubladoConfig()
 
-    async def provision_homedir(self, spawner: Spawner) -> None:
+    async def provision_homedir(
+        self, spawner: Spawner, auth_state: Dict[str, Any]
+    ) -> None:
         """Provision the home directory for the user.
 
         Parameters
         ----------
         spawner : `jupyterhub.spawner.Spawner`
-            The spawner object, used to get the authentication state and other
-            user metadata.
+            The spawner object, used to get user metadata.
+        auth_state : `dict`
+            The user's authentication state, already retrieved by the caller.
         """
-        auth_state = await spawner.user.get_auth_state()
         base_url = self.nublado_config.base_url
+
+        # Reading the token means reading a file, so only do it once and reuse
+        # the same headers for every request to moneypenny.
         token = self.nublado_config.gafaelfawr_token
+        headers = {"Authorization": f"Bearer {token}"}
 
         # Only include groups with GIDs.  Provisioning can't do anything with
         # the ones that don't have GIDs, and currently the model doesn't allow
@@ -48,36 +62,50 @@ class Provisioner(LoggingConfigurable):
         provision_url = urljoin(base_url, "moneypenny/users")
         session = await get_session()
         self.log.debug(f"Posting dossier {dossier} to {provision_url}")
-        r = await session.post(
-            provision_url,
-            json=dossier,
-            headers={"Authorization": f"Bearer {token}"},
-        )
-        self.log.debug(f"POST got {r.status}")
-        r.raise_for_status()
+        async with session.post(
+            provision_url, json=dossier, headers=headers
+        ) as r:
+            self.log.debug(f"POST got {r.status}")
+            r.raise_for_status()
+            data = await r.json()
 
         # Wait until the work has finished.
-        data = await r.json()
         if data["status"] != "active":
-            return await self._wait_for_provision(spawner.user.name)
+            return await self._wait_for_provision(spawner.user.name, headers)
+
+    async def _wait_for_provision(
+        self, username: str, headers: Dict[str, str]
+    ) -> None:
+        """Wait for provisioning to complete.
 
-    async def _wait_for_provision(self, username: str) -> None:
-        """Wait for provisioning to complete."""
+        The moneypenny wait endpoint returns as soon as provisioning finishes,
+        so this normally takes a single request.  If that request times out,
+        moneypenny may just be slow, so try again a limited number of times
+        before giving up.
+        """
         base_url = self.nublado_config.base_url
         status_url = urljoin(base_url, f"moneypenny/users/{username}/wait")
-        token = self.nublado_config.gafaelfawr_token
-        session = await get_session()
+        for attempt in range(1, WAIT_ATTEMPTS + 1):
+            try:
+                await self._wait_request(status_url, headers)
+                return
+            except asyncio.TimeoutError:
+                if attempt == WAIT_ATTEMPTS:
+                    raise
+                self.log.warning(f"Timeout waiting on {status_url}, retrying")
 
-        r = await session.get(
-            status_url,
-            headers={"Authorization": f"Bearer {token}"},
-            timeout=ClientTimeout(total=300),
-        )
-        self.log.debug(f"Moneypenny {status_url} status: {r.status}")
-        if r.status == 200:
-            data = await r.json()
-            if data["status"] != "active":
-                status = data["status"]
-                raise web.HTTPError(500, f"Moneypenny reports status {status}")
-        else:
-            r.raise_for_status()
+    async def _wait_request(self, url: str, headers: Dict[str, str]) -> None:
+        """Make a single request to the moneypenny wait endpoint."""
+        session = await get_session()
+        async with session.get(
+            url, headers=headers, timeout=ClientTimeout(total=WAIT_TIMEOUT)
+        ) as r:
+            self.log.debug(f"Moneypenny {url} status: {r.status}")
+            if r.status == 200:
+                data = await r.json()
+                if data["status"] != "active":
+                    status = data["status"]
+                    msg = f"Moneypenny reports status {status}"
+                    raise web.HTTPError(500, msg)
+            else:
+                r.raise_for_status()
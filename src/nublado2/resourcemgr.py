@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 import asyncio
-from functools import partial
+from functools import lru_cache, partial
 from io import StringIO
 from typing import TYPE_CHECKING
 
@@ -20,12 +20,40 @@ from nublado2.nublado_config import NubladoConfig
 from nublado2.provisioner import Provisioner
 
 if TYPE_CHECKING:
-    from typing import Any, Dict
+    from typing import Any, Awaitable, Dict
 
     from jupyterhub.kubespawner import KubeSpawner
 
     from nublado2.selectedoptions import SelectedOptions
 
+MAX_CONCURRENT_CREATES = 8
+"""Maximum number of user resources to create at the same time.
+
+This bounds the load a single spawn can put on the Kubernetes API server.
+"""
+
+
+@lru_cache(maxsize=128)
+def _compile_template(source: str) -> Template:
+    """Compile a Jinja template, caching the result by its source.
+
+    The templates come from configuration and are the same for every spawn,
+    so there is no need to parse them again each time.
+    """
+    return Template(source)
+
+
+@lru_cache(maxsize=1)
+def _get_hub_namespace() -> str:
+    """Read the namespace the hub is running in.
+
+    This can't change while the hub is running, so only read it once rather
+    than doing blocking file I/O on every namespace deletion check.
+    """
+    ns_path = "/var/run/secrets/kubernetes.io/serviceaccount/namespace"
+    with open(ns_path) as f:
+        return f.read().strip()
+
 
 class ResourceManager(LoggingConfigurable):
     """Create additional Kubernetes resources when spawning labs.
@@ -43,24 +71,38 @@ class ResourceManager(LoggingConfigurable):
     def __init__(self) -> None:
         self.nublado_config = NubladoConfig()
         self.provisioner = Provisioner()
-        self.yaml = YAML()
-        self.yaml.indent(mapping=2, sequence=4, offset=2)
+
+        # Neither the templated user resources nor the dask template need
+        # comments or formatting preserved, so use the safe loader and dumper,
+        # which use libyaml in C, rather than the much slower round-trip ones.
+        self.yaml = YAML(typ="safe")
+        self.yaml.default_flow_style = False
 
     async def create_user_resources(
-        self, spawner: KubeSpawner, options: SelectedOptions
+        self,
+        spawner: KubeSpawner,
+        options: SelectedOptions,
+        auth_state: Dict[str, Any],
     ) -> None:
         """Create the user resources for this spawning session."""
-        await self.provisioner.provision_homedir(spawner)
         try:
-            await exponential_backoff(
-                partial(
-                    self._wait_for_namespace_deletion,
-                    spawner,
+            # Provisioning the home directory and waiting for any old user
+            # namespace to go away are independent and both mostly waiting on
+            # other services, so do them at the same time.
+            await asyncio.gather(
+                self.provisioner.provision_homedir(spawner, auth_state),
+                exponential_backoff(
+                    partial(
+                        self._wait_for_namespace_deletion,
+                        spawner,
+                    ),
+                    f"Namespace {spawner.namespace} still being deleted",
+                    timeout=spawner.k8s_api_request_retry_timeout,
                 ),
-                f"Namespace {spawner.namespace} still being deleted",
-                timeout=spawner.k8s_api_request_retry_timeout,
             )
-            await self._create_kubernetes_resources(spawner, options)
+            await self._create_kubernetes_resources(
+                spawner, options, auth_state
+            )
         except Exception:
             self.log.exception("Exception creating user resource!")
             raise
@@ -87,7 +129,7 @@ class ResourceManager(LoggingConfigurable):
         """Create the ConfigMap that holds environment settings for the lab."""
         environment = {}
         for variable, template in self.nublado_config.lab_environment.items():
-            value = Template(template).render(template_values)
+            value = _compile_template(template).render(template_values)
             environment[variable] = value
 
         self.log.debug(f"Creating environment ConfigMap with {environment}")
@@ -109,59 +151,97 @@ class ResourceManager(LoggingConfigurable):
         )
 
     async def _create_kubernetes_resources(
-        self, spawner: KubeSpawner, options: SelectedOptions
+        self,
+        spawner: KubeSpawner,
+        options: SelectedOptions,
+        auth_state: Dict[str, Any],
     ) -> None:
-        custom_api = shared_client("CustomObjectsApi")
-        template_values = await self._build_template_values(spawner, options)
+        template_values = await self._build_template_values(
+            spawner, options, auth_state
+        )
 
         # Generate the list of additional user resources from the template.
-        t = Template(self.nublado_config.user_resources_template)
+        t = _compile_template(self.nublado_config.user_resources_template)
         templated_user_resources = t.render(template_values)
         self.log.debug("Generated user resources:")
         self.log.debug(templated_user_resources)
         resources = self.yaml.load(templated_user_resources)
 
-        # Add in the standard labels and annotations common to every resource
-        # and create the resources.
+        # Add in the standard labels and annotations common to every resource.
         for resource in resources:
             if "metadata" not in resource:
                 resource["metadata"] = {}
             resource["metadata"]["annotations"] = spawner.extra_annotations
             resource["metadata"]["labels"] = spawner.extra_labels
 
-            # Custom resources cannot be created by create_from_dict:
-            # https://github.com/kubernetes-client/python/issues/740
-            #
-            # Detect those from the apiVersion field and handle them
-            # specially.
-            api_version = resource["apiVersion"]
-            if "." in api_version and ".k8s.io/" not in api_version:
-                crd_parser = CRDParser.from_crd_body(resource)
-                await asyncio.wait_for(
-                    custom_api.create_namespaced_custom_object(
-                        body=resource,
-                        group=crd_parser.group,
-                        version=crd_parser.version,
-                        namespace=spawner.namespace,
-                        plural=crd_parser.plural,
-                    ),
-                    spawner.k8s_api_request_timeout,
-                )
-            else:
-                await asyncio.wait_for(
-                    create_from_dict(spawner.api.api_client, resource),
-                    spawner.k8s_api_request_timeout,
+        # Everything else is created inside the user namespace, so create the
+        # namespace first.  The remaining resources are independent of each
+        # other, so create them concurrently.
+        #
+        # This includes the lab environment ConfigMap.  This is constructed
+        # from configuration settings and doesn't use a resource template like
+        # other resources, but it still has to wait for the namespace.
+        for resource in resources:
+            if resource["kind"] == "Namespace":
+                await self._create_kubernetes_resource(spawner, resource)
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_CREATES)
+
+        async def limited(creation: Awaitable[None]) -> None:
+            async with semaphore:
+                await creation
+
+        await asyncio.gather(
+            limited(
+                self._create_lab_environment_configmap(
+                    spawner, template_values
                 )
+            ),
+            *(
+                limited(self._create_kubernetes_resource(spawner, r))
+                for r in resources
+                if r["kind"] != "Namespace"
+            ),
+        )
 
-        # Construct the lab environment ConfigMap.  This is constructed from
-        # configuration settings and doesn't use a resource template like
-        # other resources.  This has to be done last, becuase the namespace is
-        # created from the user resources template.
-        await self._create_lab_environment_configmap(spawner, template_values)
+    async def _create_kubernetes_resource(
+        self, spawner: KubeSpawner, resource: Dict[str, Any]
+    ) -> None:
+        """Create a single templated user resource."""
+        # Custom resources cannot be created by create_from_dict:
+        # https://github.com/kubernetes-client/python/issues/740
+        #
+        # Detect those from the apiVersion field and handle them specially.
+        api_version = resource["apiVersion"]
+        if "." in api_version and ".k8s.io/" not in api_version:
+            custom_api = shared_client("CustomObjectsApi")
+            crd_parser = CRDParser.from_crd_body(resource)
+            await asyncio.wait_for(
+                custom_api.create_namespaced_custom_object(
+                    body=resource,
+                    group=crd_parser.group,
+                    version=crd_parser.version,
+                    namespace=spawner.namespace,
+                    plural=crd_parser.plural,
+                ),
+                spawner.k8s_api_request_timeout,
+            )
+        else:
+            await asyncio.wait_for(
+                create_from_dict(spawner.api.api_client, resource),
+                spawner.k8s_api_request_timeout,
+            )
 
     async def _build_dask_template(self, spawner: KubeSpawner) -> str:
         """Build a template for dask workers from the jupyter pod manifest."""
-        dask_template = await spawner.get_pod_manifest()
+        pod_manifest = await spawner.get_pod_manifest()
+
+        # This will take the python model names and transform
+        # them to the names kubernetes expects, which to_dict
+        # alone doesn't.  Do this first and then edit the resulting
+        # dict, so that the manifest is only walked once.
+        dask_template = spawner.api.api_client.sanitize_for_serialization(
+            pod_manifest
+        )
 
         # Here we make a few mangles to the jupyter pod manifest
         # before using it for templating.  This will end up
@@ -169,29 +249,26 @@ class ResourceManager(LoggingConfigurable):
         # Unset the name of the container, to let dask make the container
         # names, otherwise you'll get an obtuse error from k8s about not
         # being able to create the container.
-        dask_template.metadata.name = None
+        dask_template["metadata"].pop("name", None)
 
         # This is an argument to the provisioning script to signal it
         # as a dask worker.
-        dask_template.spec.containers[0].env.append(
-            client.models.V1EnvVar(name="DASK_WORKER", value="TRUE")
+        container = dask_template["spec"]["containers"][0]
+        container.setdefault("env", []).append(
+            {"name": "DASK_WORKER", "value": "TRUE"}
         )
 
-        # This will take the python model names and transform
-        # them to the names kubernetes expects, which to_dict
-        # alone doesn't.
         dask_yaml_stream = StringIO()
-        self.yaml.dump(
-            spawner.api.api_client.sanitize_for_serialization(dask_template),
-            dask_yaml_stream,
-        )
+        self.yaml.dump(dask_template, dask_yaml_stream)
         return dask_yaml_stream.getvalue()
 
     async def _build_template_values(
-        self, spawner: KubeSpawner, options: SelectedOptions
+        self,
+        spawner: KubeSpawner,
+        options: SelectedOptions,
+        auth_state: Dict[str, Any],
     ) -> Dict[str, Any]:
         """Construct the template variables for Jinja templating."""
-        auth_state = await spawner.user.get_auth_state()
         groups = auth_state["groups"]
 
         # Build a comma-separated list of groups used to populate the
@@ -200,7 +277,7 @@ class ResourceManager(LoggingConfigurable):
         #
         # Example: group1:1000,group2:1001,group3:1002
         external_groups = ",".join(
-            [f'{g["name"]}:{g["id"]}' for g in groups if "id" in g]
+            f'{g["name"]}:{g["id"]}' for g in groups if "id" in g
         )
 
         # Define the template variables.
@@ -247,12 +324,10 @@ class ResourceManager(LoggingConfigurable):
             # This is true for Rubin user namespaces, but might not be
             # universally.
             #
-            # If opening the ns_path file fails, it means we are not running
+            # If reading the hub namespace fails, it means we are not running
             # in a namespace with service accounts enabled, in which case
             # we definitely want to let the exception crash the process.
-            ns_path = "/var/run/secrets/kubernetes.io/serviceaccount/namespace"
-            with open(ns_path) as f:
-                hub_ns = f.read().strip()
+            hub_ns = _get_hub_namespace()
             assert ns_name.startswith(f"{hub_ns}-")
 
             namespace = await asyncio.wait_for(
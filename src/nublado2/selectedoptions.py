@@ -13,6 +13,8 @@ class SelectedOptions:
     get parsed out of the user return form data.  That way we can
     have strong typing over them, and one place to parse them out."""
 
+    __slots__ = ("_image_info", "_size", "_debug", "_reset_user_env")
+
     def __init__(self, options: Dict[str, Any]) -> None:
         """Create a SelectedOptions instance from the formdata."""
 
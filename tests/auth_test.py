@@ -7,6 +7,7 @@ This tests the logic that's sufficiently separable to run in a test harness.
 
 from __future__ import annotations
 
+import hashlib
 from typing import Any, AsyncGenerator, Callable, Dict
 from unittest.mock import MagicMock, patch
 
@@ -20,6 +21,7 @@ from nublado2.auth import (
     GafaelfawrAuthenticator,
     GafaelfawrLoginHandler,
     GafaelfawrLogoutHandler,
+    _auth_cache,
     _build_auth_info,
 )
 
@@ -34,6 +36,12 @@ async def config_mock() -> AsyncGenerator:
         yield mock.return_value
 
 
+@pytest.fixture(autouse=True)
+def clear_auth_cache() -> None:
+    """Start each test without any cached token lookups."""
+    _auth_cache.clear()
+
+
 def test_authenticator() -> None:
     authenticator = GafaelfawrAuthenticator()
     assert authenticator.get_handlers(MagicMock()) == [
@@ -70,12 +78,22 @@ async def test_login_handler(config_mock: MagicMock) -> None:
             await _build_auth_info(headers)
 
     # Bad API response payload.
+    _auth_cache.clear()
     with aioresponses() as m:
         m.get(url, payload={}, status=200)
         with pytest.raises(web.HTTPError):
             await _build_auth_info(headers)
 
+    # Oversized API response payload.
+    _auth_cache.clear()
+    with aioresponses() as m:
+        data = {"username": "foo", "uid": 1234, "padding": "x" * 100000}
+        m.get(url, payload=data, status=200)
+        with pytest.raises(web.HTTPError):
+            await _build_auth_info(headers)
+
     # Test minimum data.
+    _auth_cache.clear()
     with aioresponses() as m:
         handler = build_userinfo_handler({"username": "foo", "uid": 1234})
         m.get(url, callback=handler)
@@ -90,6 +108,7 @@ async def test_login_handler(config_mock: MagicMock) -> None:
         }
 
     # Test full data.
+    _auth_cache.clear()
     with aioresponses() as m:
         handler = build_userinfo_handler(
             {
@@ -116,3 +135,49 @@ async def test_login_handler(config_mock: MagicMock) -> None:
                 ],
             },
         }
+
+
+@pytest.mark.asyncio
+async def test_auth_cache(config_mock: MagicMock) -> None:
+    headers = HTTPHeaders({"X-Auth-Request-Token": "user-token"})
+    url = "https://data.example.com/auth/api/v1/user-info"
+    expected = {
+        "name": "foo",
+        "auth_state": {
+            "username": "foo",
+            "uid": 1234,
+            "token": "user-token",
+            "groups": [],
+        },
+    }
+
+    # The mock only answers once, so the second lookup must be cached.
+    with aioresponses() as m:
+        handler = build_userinfo_handler({"username": "foo", "uid": 1234})
+        m.get(url, callback=handler)
+        assert await _build_auth_info(headers) == expected
+        assert await _build_auth_info(headers) == expected
+
+    # A different token is not served from the cache.
+    other_headers = HTTPHeaders({"X-Auth-Request-Token": "other-token"})
+    with aioresponses() as m:
+        m.get(url, status=403)
+        with pytest.raises(web.HTTPError):
+            await _build_auth_info(other_headers)
+
+        # Failures are cached as well, so retrying the bad token raises the
+        # same error without another request.
+        with pytest.raises(web.HTTPError) as excinfo:
+            await _build_auth_info(other_headers)
+        assert excinfo.value.status_code == 500
+
+    # Only the status and message of the failure are kept, not the exception.
+    key = hashlib.sha256(b"other-token").hexdigest()
+    assert _auth_cache[key][1] == (500, "Cannot reach token analysis API")
+
+    # But only briefly.  Expire the cached failure rather than waiting.
+    _auth_cache[key] = (0, _auth_cache[key][1])
+    with aioresponses() as m:
+        m.get(url, payload={"username": "other", "uid": 5678})
+        auth_info = await _build_auth_info(other_headers)
+        assert auth_info["name"] == "other"
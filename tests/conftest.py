@@ -0,0 +1,21 @@
+"""Test fixtures shared by all of the tests."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Iterator
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def event_loop() -> Iterator[asyncio.AbstractEventLoop]:
+    """Use one event loop for the whole test session.
+
+    This avoids creating a new loop for each test, and lets the shared
+    aiohttp session from `nublado2.http.get_session` be reused across tests
+    rather than being left attached to a closed loop.
+    """
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 from typing import Any, AsyncGenerator, Callable, Dict, List, Union
 from unittest.mock import MagicMock, Mock, patch
@@ -72,7 +73,6 @@ async def test_provision() -> None:
         "uid": 1234,
         "groups": [{"name": "foo", "id": 1234}],
     }
-    spawner.user.get_auth_state.return_value = auth_state
 
     commission_url = "https://data.example.com/moneypenny/users"
     status_url = "https://data.example.com/moneypenny/users/someuser"
@@ -84,7 +84,9 @@ async def test_provision() -> None:
         m.post(commission_url, callback=handler)
         m.get(status_url, callback=handler, repeat=True)
         m.get(wait_url, callback=handler)
-        await resource_manager.provisioner.provision_homedir(spawner)
+        await resource_manager.provisioner.provision_homedir(
+            spawner, auth_state
+        )
 
 
 @pytest.mark.asyncio
@@ -97,7 +99,6 @@ async def test_no_gids() -> None:
         "uid": 1234,
         "groups": [{"name": "foo"}],
     }
-    spawner.user.get_auth_state.return_value = auth_state
 
     commission_url = "https://data.example.com/moneypenny/users"
     status_url = "https://data.example.com/moneypenny/users/someuser"
@@ -107,4 +108,48 @@ async def test_no_gids() -> None:
         m.post(commission_url, callback=handler)
         m.get(status_url, callback=handler, repeat=True)
         m.get(wait_url, callback=handler)
-        await resource_manager.provisioner.provision_homedir(spawner)
+        await resource_manager.provisioner.provision_homedir(
+            spawner, auth_state
+        )
+
+
+@pytest.mark.asyncio
+async def test_wait_retry() -> None:
+    resource_manager = ResourceManager()
+    spawner = Mock(spec=Spawner)
+    spawner.user = Mock(spec=User)
+    spawner.user.name = "someuser"
+    auth_state = {
+        "uid": 1234,
+        "groups": [{"name": "foo", "id": 1234}],
+    }
+
+    commission_url = "https://data.example.com/moneypenny/users"
+    status_url = "https://data.example.com/moneypenny/users/someuser"
+    wait_url = "https://data.example.com/moneypenny/users/someuser/wait"
+
+    # The first wait times out, but the retry succeeds.
+    with aioresponses() as m:
+        handler = build_handler(
+            "someuser", 1234, [{"name": "foo", "id": 1234}]
+        )
+        m.post(commission_url, callback=handler)
+        m.get(status_url, callback=handler, repeat=True)
+        m.get(wait_url, exception=asyncio.TimeoutError())
+        m.get(wait_url, callback=handler)
+        await resource_manager.provisioner.provision_homedir(
+            spawner, auth_state
+        )
+
+    # If every wait times out, the timeout is raised.
+    with aioresponses() as m:
+        handler = build_handler(
+            "someuser", 1234, [{"name": "foo", "id": 1234}]
+        )
+        m.post(commission_url, callback=handler)
+        m.get(status_url, callback=handler, repeat=True)
+        m.get(wait_url, exception=asyncio.TimeoutError(), repeat=True)
+        with pytest.raises(asyncio.TimeoutError):
+            await resource_manager.provisioner.provision_homedir(
+                spawner, auth_state
+            )
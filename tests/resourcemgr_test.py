@@ -3,14 +3,16 @@
 from __future__ import annotations
 
 import asyncio
-import sys
-from typing import Any, Dict, Iterator, List
+import copy
+from functools import partial
+from typing import Any, Dict, Iterator, List, Tuple
 from unittest.mock import Mock, patch
 
 import pytest
 from jupyterhub.user import User
 from kubernetes_asyncio.client import (
     ApiClient,
+    V1ConfigMap,
     V1Container,
     V1EnvVar,
     V1ObjectMeta,
@@ -27,6 +29,15 @@ from nublado2.selectedoptions import SelectedOptions
 
 # Mock user resources template to test the template engine.
 USER_RESOURCES_TEMPLATE = """
+- apiVersion: v1
+  kind: ConfigMap
+  metadata:
+    name: before-namespace
+    namespace: "{{ user_namespace }}"
+- apiVersion: v1
+  kind: Namespace
+  metadata:
+    name: "{{ user_namespace }}"
 - apiVersion: v1
   kind: ConfigMap
   metadata:
@@ -57,6 +68,168 @@ USER_RESOURCES_TEMPLATE = """
     type: Opaque
 """
 
+NAMESPACE = "nublado2-someuser"
+"""Namespace of the test user."""
+
+ANNOTATIONS = {
+    "argocd.argoproj.io/compare-options": "IgnoreExtraneous",
+    "argocd.argoproj.io/sync-options": "Prune=false",
+}
+"""Annotations added to every user resource."""
+
+LABELS = {
+    "hub.jupyter.org/network-access-hub": "true",
+    "argocd.argoproj.io/instance": "nublado-users",
+}
+"""Labels added to every user resource."""
+
+AUTH_STATE = {
+    "token": "user-token",
+    "uid": 1234,
+    "gid": 1551,
+    "groups": [
+        {"name": "foo", "id": 1235},
+        {"name": "primary", "id": 1551},
+        {"name": "bar", "id": 4567},
+        {"name": "baz"},
+    ],
+}
+"""Authentication state of the test user."""
+
+POD_MANIFEST = V1Pod(
+    api_version="v1",
+    kind="Pod",
+    metadata=V1ObjectMeta(
+        name="user-pod",
+        namespace=NAMESPACE,
+    ),
+    spec=V1PodSpec(
+        containers=[
+            V1Container(
+                name="container",
+                command=["run-something"],
+                env=[V1EnvVar(name="FOO", value="BAR")],
+                image="blah:latest",
+            )
+        ],
+    ),
+)
+"""Pod manifest returned by the spawner, used to build the dask template."""
+
+EXPECTED_DASK_YAML = """\
+apiVersion: v1
+kind: Pod
+metadata:
+  namespace: nublado2-someuser
+spec:
+  containers:
+  - command:
+    - run-something
+    env:
+    - name: FOO
+      value: BAR
+    - name: DASK_WORKER
+      value: 'TRUE'
+    image: blah:latest
+    name: container
+"""
+"""Expected dask worker template built from `POD_MANIFEST`."""
+
+EXPECTED_OBJECTS: Dict[Tuple[str, str], Dict[str, Any]] = {
+    ("Namespace", NAMESPACE): {
+        "apiVersion": "v1",
+        "kind": "Namespace",
+        "metadata": {
+            "name": NAMESPACE,
+            "annotations": ANNOTATIONS,
+            "labels": LABELS,
+        },
+    },
+    ("ConfigMap", "before-namespace"): {
+        "apiVersion": "v1",
+        "kind": "ConfigMap",
+        "metadata": {
+            "name": "before-namespace",
+            "namespace": NAMESPACE,
+            "annotations": ANNOTATIONS,
+            "labels": LABELS,
+        },
+    },
+    ("ConfigMap", "dask"): {
+        "apiVersion": "v1",
+        "kind": "ConfigMap",
+        "metadata": {
+            "name": "dask",
+            "namespace": NAMESPACE,
+            "annotations": ANNOTATIONS,
+            "labels": LABELS,
+        },
+        "data": {
+            "dask_worker.yml": EXPECTED_DASK_YAML,
+        },
+    },
+    ("ConfigMap", "group"): {
+        "apiVersion": "v1",
+        "kind": "ConfigMap",
+        "metadata": {
+            "name": "group",
+            "namespace": NAMESPACE,
+            "annotations": ANNOTATIONS,
+            "labels": LABELS,
+        },
+        "data": {
+            "user": "someuser:x:1234:1551::/home/someuser:/bin/bash\n",
+            "group": (
+                "foo:x:1235:someuser\n"
+                "primary:x:1551:\n"
+                "bar:x:4567:someuser\n"
+            ),
+        },
+    },
+    ("ConfigMap", "lab-environment"): {
+        "apiVersion": "v1",
+        "kind": "ConfigMap",
+        "metadata": {
+            "name": "lab-environment",
+            "namespace": NAMESPACE,
+            "annotations": ANNOTATIONS,
+            "labels": LABELS,
+        },
+        "data": {
+            "EXTERNAL_INSTANCE_URL": "https://data.example.com/",
+            "FIREFLY_ROUTE": "/portal/app",
+            "HUB_ROUTE": "/nb/hub/",
+            "EXTERNAL_GID": "1551",
+            "EXTERNAL_GROUPS": "foo:1235,primary:1551,bar:4567",
+            "EXTERNAL_UID": "1234",
+            "ACCESS_TOKEN": "user-token",
+            "IMAGE_DIGEST": "sha256:123456789abcdef",
+            "IMAGE_DESCRIPTION": "blah blah blah",
+            "CLEAR_DOTLOCAL": "true",
+            "DEBUG": "TRUE",
+        },
+    },
+}
+"""Expected regular objects, keyed by kind and name."""
+
+EXPECTED_CUSTOM: Dict[Tuple[str, str], Dict[str, Any]] = {
+    ("VaultSecret", "butler-secret"): {
+        "apiVersion": "ricoberger.de/v1alpha1",
+        "kind": "VaultSecret",
+        "metadata": {
+            "name": "butler-secret",
+            "namespace": NAMESPACE,
+            "annotations": ANNOTATIONS,
+            "labels": LABELS,
+        },
+        "spec": {
+            "path": "k8s_operator/data/butler",
+            "type": "Opaque",
+        },
+    }
+}
+"""Expected custom objects, keyed by kind and name."""
+
 
 class KubernetesApiMock:
     """Mocks the bits of the Kubernetes API that we use.
@@ -65,15 +238,39 @@ class KubernetesApiMock:
     portions of each).
     """
 
+    __slots__ = ("objects", "custom", "created", "api_client")
+
     def __init__(self) -> None:
         self.objects: List[Dict[str, Any]] = []
         self.custom: List[Dict[str, Any]] = []
+        self.created: List[Tuple[str, str]] = []
         self.api_client = ApiClient()
 
-    async def create_object(self, kind: str, body: Any) -> bool:
+    def reset(self) -> None:
+        self.objects.clear()
+        self.custom.clear()
+        self.created.clear()
+
+    async def create_namespaced_config_map(
+        self, namespace: str, body: V1ConfigMap
+    ) -> None:
+        # KubeSpawner's resource creation only works with models.
+        assert isinstance(body, V1ConfigMap)
+        assert body.metadata.namespace == namespace
         body_as_dict = self.api_client.sanitize_for_serialization(body)
         self.objects.append(body_as_dict)
-        return True
+        self.created.append((body.kind, body.metadata.name))
+
+    async def create_from_dict(
+        self, k8s_client: ApiClient, data: Dict[str, Any]
+    ) -> None:
+        if data["kind"] == "Namespace":
+            # Give anything started concurrently with the namespace a chance
+            # to run first, so that it would show up ahead of the namespace
+            # in the creation order.
+            await asyncio.sleep(0)
+        self.objects.append(data)
+        self.created.append((data["kind"], data["metadata"]["name"]))
 
     async def create_namespaced_custom_object(
         self,
@@ -89,12 +286,22 @@ class KubernetesApiMock:
         assert crd_info.plural == plural
         assert body["metadata"]["namespace"] == namespace
         self.custom.append(body)
+        self.created.append((body["kind"], body["metadata"]["name"]))
 
     def shared_client_mock(self, typ: str) -> Any:
         return self.api_client if typ == "ApiClient" else self
 
 
-@pytest.fixture(autouse=True)
+def by_kind_and_name(
+    objects: List[Dict[str, Any]]
+) -> Dict[Tuple[str, str], Dict[str, Any]]:
+    """Index Kubernetes objects by kind and name for comparison."""
+    result = {(o["kind"], o["metadata"]["name"]): o for o in objects}
+    assert len(result) == len(objects), "Duplicate objects created"
+    return result
+
+
+@pytest.fixture(scope="module", autouse=True)
 def config_mock() -> Iterator[None]:
     with patch("nublado2.resourcemgr.NubladoConfig") as mock:
         mock.return_value = Mock(spec=NubladoConfig)
@@ -120,78 +327,57 @@ def config_mock() -> Iterator[None]:
             yield
 
 
-@pytest.fixture(autouse=True)
-def kubernetes_api_mock() -> Iterator[KubernetesApiMock]:
+@pytest.fixture(scope="module")
+def patched_kubernetes_api() -> Iterator[KubernetesApiMock]:
+    """Patch the Kubernetes API once for all of the tests in this module.
+
+    Building the mock creates an ApiClient, which is expensive, so share it
+    and reset only the recorded objects between tests.
+    """
     mock_api = KubernetesApiMock()
-    with patch("nublado2.resourcemgr.create_from_dict") as create_mock:
-        create_mock.side_effect = lambda _, r: mock_api.objects.append(r)
-        with patch("nublado2.resourcemgr.shared_client") as client_mock:
-            client_mock.side_effect = mock_api.shared_client_mock
-            yield mock_api
+    with patch.multiple(
+        "nublado2.resourcemgr",
+        create_from_dict=mock_api.create_from_dict,
+        shared_client=mock_api.shared_client_mock,
+    ):
+        yield mock_api
+
+
+@pytest.fixture(autouse=True)
+def kubernetes_api_mock(
+    patched_kubernetes_api: KubernetesApiMock,
+) -> KubernetesApiMock:
+    patched_kubernetes_api.reset()
+    return patched_kubernetes_api
 
 
 @pytest.mark.asyncio
+@pytest.mark.parametrize("debug", ["TRUE", ""])
 async def test_create_kubernetes_resources(
-    kubernetes_api_mock: KubernetesApiMock,
+    kubernetes_api_mock: KubernetesApiMock, debug: str
 ) -> None:
     spawner = Mock(spec=KubeSpawner)
     spawner.k8s_api_request_timeout = 3
     spawner.k8s_api_request_retry_timeout = 30
-    spawner.namespace = "nublado2-someuser"
-    spawner.extra_annotations = {
-        "argocd.argoproj.io/compare-options": "IgnoreExtraneous",
-        "argocd.argoproj.io/sync-options": "Prune=false",
-    }
-    spawner.extra_labels = {
-        "hub.jupyter.org/network-access-hub": "true",
-        "argocd.argoproj.io/instance": "nublado-users",
-    }
-    spawner._make_create_resource_request = kubernetes_api_mock.create_object
+    spawner.namespace = NAMESPACE
+    spawner.extra_annotations = ANNOTATIONS
+    spawner.extra_labels = LABELS
+
+    # Use the real KubeSpawner method to create the lab environment
+    # ConfigMap, so that the test catches bodies it can't handle.
+    spawner._make_create_resource_request = partial(
+        KubeSpawner._make_create_resource_request, spawner
+    )
+
     spawner.hub = Mock()
     spawner.hub.base_url = "/nb/hub/"
     spawner.user = Mock(spec=User)
     spawner.user.name = "someuser"
     spawner.api = kubernetes_api_mock
-    auth_state = {
-        "token": "user-token",
-        "uid": 1234,
-        "gid": 1551,
-        "groups": [
-            {"name": "foo", "id": 1235},
-            {"name": "primary", "id": 1551},
-            {"name": "bar", "id": 4567},
-            {"name": "baz"},
-        ],
-    }
-    pod_manifest = V1Pod(
-        api_version="v1",
-        kind="Pod",
-        metadata=V1ObjectMeta(
-            name="user-pod",
-            namespace=spawner.namespace,
-        ),
-        spec=V1PodSpec(
-            containers=[
-                V1Container(
-                    name="container",
-                    command=["run-something"],
-                    env=[V1EnvVar(name="FOO", value="BAR")],
-                    image="blah:latest",
-                )
-            ],
-        ),
-    )
-    if sys.version_info < (3, 8):
-        spawner.get_pod_manifest.return_value = asyncio.Future()
-        spawner.get_pod_manifest.return_value.set_result(pod_manifest)
-        spawner.user.get_auth_state.return_value = asyncio.Future()
-        spawner.user.get_auth_state.return_value.set_result(auth_state)
-    else:
-        spawner.get_pod_manifest.return_value = pod_manifest
-        spawner.user.get_auth_state.return_value = auth_state
+    spawner.get_pod_manifest.return_value = POD_MANIFEST
 
     options = Mock(spec=SelectedOptions)
-    options.debug = "true"
+    options.debug = debug
     options.clear_dotlocal = "true"
     options.image_info = ImageInfo(
         reference="registry.hub.docker.com/lsstsqre/sciplat-lab:w_2021_13",
@@ -200,100 +386,19 @@ async def test_create_kubernetes_resources(
     )
 
     resource_manager = ResourceManager()
-    await resource_manager._create_kubernetes_resources(spawner, options)
-
-    assert sorted(
-        kubernetes_api_mock.objects,
-        key=lambda o: (o["kind"], o["metadata"]["name"]),
-    ) == [
-        {
-            "apiVersion": "v1",
-            "kind": "ConfigMap",
-            "metadata": {
-                "name": "dask",
-                "namespace": spawner.namespace,
-                "annotations": spawner.extra_annotations,
-                "labels": spawner.extra_labels,
-            },
-            "data": {
-                "dask_worker.yml": f"""\
-apiVersion: v1
-kind: Pod
-metadata:
-  namespace: {spawner.namespace}
-spec:
-  containers:
-    - command:
-        - run-something
-      env:
-        - name: FOO
-          value: BAR
-        - name: DASK_WORKER
-          value: 'TRUE'
-      image: blah:latest
-      name: container
-"""
-            },
-        },
-        {
-            "apiVersion": "v1",
-            "kind": "ConfigMap",
-            "metadata": {
-                "name": "group",
-                "namespace": spawner.namespace,
-                "annotations": spawner.extra_annotations,
-                "labels": spawner.extra_labels,
-            },
-            "data": {
-                "user": "someuser:x:1234:1551::/home/someuser:/bin/bash\n",
-                "group": (
-                    "foo:x:1235:someuser\n"
-                    "primary:x:1551:\n"
-                    "bar:x:4567:someuser\n"
-                ),
-            },
-        },
-        {
-            "apiVersion": "v1",
-            "kind": "ConfigMap",
-            "metadata": {
-                "name": "lab-environment",
-                "namespace": spawner.namespace,
-                "annotations": spawner.extra_annotations,
-                "labels": spawner.extra_labels,
-            },
-            "data": {
-                "EXTERNAL_INSTANCE_URL": "https://data.example.com/",
-                "FIREFLY_ROUTE": "/portal/app",
-                "HUB_ROUTE": "/nb/hub/",
-                "EXTERNAL_GID": "1551",
-                "EXTERNAL_GROUPS": "foo:1235,primary:1551,bar:4567",
-                "EXTERNAL_UID": "1234",
-                "ACCESS_TOKEN": "user-token",
-                "IMAGE_DIGEST": "sha256:123456789abcdef",
-                "IMAGE_DESCRIPTION": "blah blah blah",
-                "CLEAR_DOTLOCAL": "true",
-                "DEBUG": "true",
-            },
-        },
-    ]
-
-    assert sorted(
-        kubernetes_api_mock.custom,
-        key=lambda o: (o["kind"], o["metadata"]["name"]),
-    ) == [
-        {
-            "apiVersion": "ricoberger.de/v1alpha1",
-            "kind": "VaultSecret",
-            "metadata": {
-                "name": "butler-secret",
-                "namespace": spawner.namespace,
-                "annotations": spawner.extra_annotations,
-                "labels": spawner.extra_labels,
-            },
-            "spec": {
-                "path": "k8s_operator/data/butler",
-                "type": "Opaque",
-            },
-        }
-    ]
+    await resource_manager._create_kubernetes_resources(
+        spawner, options, AUTH_STATE
+    )
+
+    # The debug option is passed through to the lab environment unchanged.
+    expected_objects = copy.deepcopy(EXPECTED_OBJECTS)
+    expected_objects[("ConfigMap", "lab-environment")]["data"]["DEBUG"] = debug
+    assert by_kind_and_name(kubernetes_api_mock.objects) == expected_objects
+    assert by_kind_and_name(kubernetes_api_mock.custom) == EXPECTED_CUSTOM
+
+    # Everything else lives in the user namespace, so the namespace must be
+    # created before any other object, even ones listed before it.
+    assert kubernetes_api_mock.created[0] == ("Namespace", NAMESPACE)
+    assert len(kubernetes_api_mock.created) == len(EXPECTED_OBJECTS) + len(
+        EXPECTED_CUSTOM
+    )